@@ -4,7 +4,9 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
-import time
+from numba import njit, prange
+import threading
+import queue
 import json
 from datetime import datetime, timedelta
 import io
@@ -18,8 +20,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling; cached so the string is built once and
+# reruns re-send an identical (no-op) delta to the frontend
+@st.cache_data
+def _page_css():
+    return """
 <style>
     .main-header {
         background: linear-gradient(135deg, #4f46e5, #7c3aed);
@@ -71,7 +76,20 @@ st.markdown("""
         background: linear-gradient(135deg, #0a0e1a, #1a1f2e);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_data
+def _page_header():
+    return ('<h1 class="main-header">⚡ Battery Cell Monitoring & '
+            'Task Management System</h1>')
+
+@st.cache_data
+def _page_subtitle():
+    return ('<p style="text-align: center; color: #94a3b8; font-size: 1.1rem;">'
+            'Advanced real-time monitoring with intelligent task automation '
+            'and comprehensive analytics</p>')
+
+st.markdown(_page_css(), unsafe_allow_html=True)
 
 # Initialize session state
 def init_session_state():
@@ -81,8 +99,8 @@ def init_session_state():
         st.session_state.tasks_data = []
     if 'monitoring_active' not in st.session_state:
         st.session_state.monitoring_active = False
-    if 'session_data' not in st.session_state:
-        st.session_state.session_data = []
+    if 'hist' not in st.session_state:
+        st.session_state.hist = None
     if 'previous_session_data' not in st.session_state:
         st.session_state.previous_session_data = []
     if 'bench_name' not in st.session_state:
@@ -118,96 +136,279 @@ CELL_TYPES = {
     }
 }
 
-def generate_cell_data(cell_type):
-    """Generate realistic cell data based on type"""
-    specs = CELL_TYPES[cell_type]
-    base_voltage = specs["nominal_voltage"]
-    voltage_variation = (np.random.random() - 0.5) * 0.2
-    voltage = np.clip(base_voltage + voltage_variation, 
-                     specs["minimum_voltage"], 
-                     specs["maximum_voltage"])
-    
-    current = max(0.1, 0.8 + (np.random.random() - 0.5) * 0.5)
-    temperature = 25 + np.random.random() * 20
-    capacity = voltage * current
-    
-    voltage_range = specs["maximum_voltage"] - specs["minimum_voltage"]
-    soc = ((voltage - specs["minimum_voltage"]) / voltage_range) * 100
-    
+# Integer-indexed spec arrays derived once at import so the hot paths do a
+# single array index per cell instead of repeated string-keyed dict lookups
+TYPE_ID = {cell_type: i for i, cell_type in enumerate(CELL_TYPES)}
+TYPE_NAME = list(CELL_TYPES)
+NOMINAL_V = np.array([specs["nominal_voltage"] for specs in CELL_TYPES.values()])
+MIN_V = np.array([specs["minimum_voltage"] for specs in CELL_TYPES.values()])
+MAX_V = np.array([specs["maximum_voltage"] for specs in CELL_TYPES.values()])
+
+# Single PCG64 generator reused across calls instead of the legacy global API;
+# cache_resource instantiates it once per process and shares it across reruns
+@st.cache_resource
+def _rng():
+    return np.random.default_rng()
+
+def generate_cells_batch(types):
+    """Generate realistic cell data for a whole batch of cells at once"""
+    n = len(types)
+    type_ids = np.array([TYPE_ID[t] for t in types])
+
+    # One RNG draw for the batch, then one fused compiled pass
+    rand = _rng().random((n, 3))
+    voltage = np.empty(n)
+    current = np.empty(n)
+    temperature = np.empty(n)
+    capacity = np.empty(n)
+    soc = np.empty(n)
+    codes = np.empty(n, np.int8)
+
+    _tick_kernel(NOMINAL_V[type_ids], MIN_V[type_ids], MAX_V[type_ids], rand,
+                 voltage, current, temperature, capacity, soc, codes)
+
+    # One clock read per batch, shared by every cell in the tick
+    now = datetime.now()
+
+    return [
+        {
+            "voltage": float(voltage[i]),
+            "current": float(current[i]),
+            "temperature": float(temperature[i]),
+            "capacity": float(capacity[i]),
+            "soc": float(soc[i]),
+            "type_id": int(type_ids[i]),
+            "status_code": int(codes[i]),
+            "status_str": STATUS_TABLE[codes[i]]["status"],
+            "timestamp": now
+        }
+        for i in range(n)
+    ]
+
+# Status codes emitted by the classification kernel
+STATUS_TABLE = [
+    {"status": "🟢 Normal", "color": "normal"},
+    {"status": "🔋 High", "color": "normal"},
+    {"status": "⚠️ Warning", "color": "warning"},
+    {"status": "🚨 Critical", "color": "critical"}
+]
+
+@njit(cache=True, parallel=True)
+def _tick_kernel(nominal, min_v, max_v, rand,
+                 out_v, out_cur, out_t, out_cap, out_soc, out_code):
+    """Fused per-tick kernel: readings, derived values and status in one pass"""
+    for i in prange(nominal.size):
+        v = nominal[i] + (rand[i, 0] - 0.5) * 0.2
+        if v < min_v[i]:
+            v = min_v[i]
+        elif v > max_v[i]:
+            v = max_v[i]
+
+        cur = 0.8 + (rand[i, 1] - 0.5) * 0.5
+        if cur < 0.1:
+            cur = 0.1
+
+        t = 25.0 + rand[i, 2] * 20.0
+        cap = v * cur
+        soc = (v - min_v[i]) / (max_v[i] - min_v[i]) * 100.0
+
+        v = round(v, 2)
+        t = round(t, 1)
+
+        out_v[i] = v
+        out_cur[i] = round(cur, 2)
+        out_t[i] = t
+        out_cap[i] = round(cap, 2)
+        out_soc[i] = round(soc, 1)
+
+        if v <= min_v[i] * 1.1 or t > 45.0:
+            out_code[i] = 3
+        elif v <= min_v[i] * 1.2 or t > 40.0:
+            out_code[i] = 2
+        elif v >= max_v[i] * 0.9:
+            out_code[i] = 1
+        else:
+            out_code[i] = 0
+
+# Maximum monitoring snapshots kept in the history ring buffer
+MAX_TICKS = 4096
+
+def alloc_history(names, types):
+    """Preallocate the fixed-size columnar history store for a cell bank"""
+    shape = (MAX_TICKS, len(names))
     return {
-        "voltage": round(voltage, 2),
-        "current": round(current, 2),
-        "temperature": round(temperature, 1),
-        "capacity": round(capacity, 2),
-        "soc": round(soc, 1),
-        "timestamp": datetime.now()
+        'v': np.full(shape, np.nan, dtype=np.float32),
+        't': np.full(shape, np.nan, dtype=np.float32),
+        'cur': np.full(shape, np.nan, dtype=np.float32),
+        'cap': np.full(shape, np.nan, dtype=np.float32),
+        'soc': np.full(shape, np.nan, dtype=np.float32),
+        'avg_soc': np.full(MAX_TICKS, np.nan, dtype=np.float32),
+        'code': np.zeros(shape, dtype=np.int8),
+        'ts': np.empty(MAX_TICKS, dtype='datetime64[ns]'),
+        'task_type': np.full(MAX_TICKS, 'None', dtype=object),
+        'task_progress': np.zeros(MAX_TICKS, dtype=np.float32),
+        'names': list(names),
+        'types': list(types),
+        'lock': threading.Lock(),
+        'idx': 0
     }
 
-def get_cell_status(voltage, temperature, cell_type):
-    """Determine cell status based on parameters"""
-    specs = CELL_TYPES[cell_type]
-    
-    if voltage <= specs["minimum_voltage"] * 1.1 or temperature > 45:
-        return {"status": "🚨 Critical", "color": "critical"}
-    elif voltage <= specs["minimum_voltage"] * 1.2 or temperature > 40:
-        return {"status": "⚠️ Warning", "color": "warning"}
-    elif voltage >= specs["maximum_voltage"] * 0.9:
-        return {"status": "🔋 High", "color": "normal"}
-    else:
-        return {"status": "🟢 Normal", "color": "normal"}
+def record_tick(hist, cells_data, tasks_data):
+    """Write one monitoring snapshot into the ring buffer (O(1) append)"""
+    n = len(cells_data)
+    row = hist['idx'] % MAX_TICKS
+
+    hist['v'][row] = np.fromiter((c['voltage'] for c in cells_data), np.float32, n)
+    hist['t'][row] = np.fromiter((c['temperature'] for c in cells_data), np.float32, n)
+    hist['cur'][row] = np.fromiter((c['current'] for c in cells_data), np.float32, n)
+    hist['cap'][row] = np.fromiter((c['capacity'] for c in cells_data), np.float32, n)
+    hist['soc'][row] = np.fromiter((c['soc'] for c in cells_data), np.float32, n)
+    hist['code'][row] = np.fromiter((c['status_code'] for c in cells_data), np.int8, n)
+    hist['avg_soc'][row] = hist['soc'][row].mean()
+    hist['ts'][row] = np.datetime64(cells_data[0]['timestamp'])
+
+    active_task = next((task for task in tasks_data
+                        if task.get('status') == 'running'), None)
+    hist['task_type'][row] = active_task['type'] if active_task else 'None'
+    hist['task_progress'][row] = active_task.get('progress', 0) if active_task else 0
+
+    hist['idx'] += 1
+
+def _snapshot_worker(tick_queue):
+    """Generate and record snapshots off the render thread"""
+    while True:
+        hist, cells_data, tasks_data = tick_queue.get()
+        try:
+            new_batch = generate_cells_batch([cell['type'] for cell in cells_data])
+            with hist['lock']:
+                for cell, new_data in zip(cells_data, new_batch):
+                    cell.update(new_data)
+                record_tick(hist, cells_data, tasks_data)
+        finally:
+            tick_queue.task_done()
+
+# One worker per process; the UI just enqueues tick requests
+@st.cache_resource
+def _tick_queue():
+    tick_queue = queue.Queue()
+    threading.Thread(target=_snapshot_worker, args=(tick_queue,),
+                     daemon=True).start()
+    return tick_queue
+
+def request_tick():
+    """Queue a data refresh + snapshot for the background worker"""
+    _tick_queue().put_nowait((st.session_state.hist,
+                              st.session_state.cells_data,
+                              st.session_state.tasks_data))
+
+def history_rows(hist):
+    """Row indices of the recorded snapshots, oldest first"""
+    n = min(hist['idx'], MAX_TICKS)
+    return np.arange(hist['idx'] - n, hist['idx']) % MAX_TICKS
+
+def lttb(x, y, n_out=1000):
+    """Downsample a series to n_out points with Largest-Triangle-Three-Buckets,
+    keeping the visible shape while cutting the point count sent to Plotly"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    xf = np.asarray(x)
+    if xf.dtype.kind == 'M':
+        xf = xf.astype('int64')
+    xf = xf.astype(np.float64)
+    yf = np.asarray(y, dtype=np.float64)
+
+    # First and last samples are always kept; the rest fall into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            a = lo
+            indices[i + 1] = a
+            continue
+
+        # Average of the following bucket (or the final point)
+        next_hi = edges[i + 2] if i + 2 < n_out - 1 else n
+        avg_x = xf[hi:max(next_hi, hi + 1)].mean()
+        avg_y = yf[hi:max(next_hi, hi + 1)].mean()
+
+        # Pick the point forming the largest triangle with the previous
+        # selection and the next bucket's average
+        areas = np.abs((xf[a] - avg_x) * (yf[lo:hi] - yf[a])
+                       - (xf[a] - xf[lo:hi]) * (avg_y - yf[a]))
+        a = lo + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return x[indices], y[indices]
+
+def _get_cached_series_chart(state_key, cells_data, title, yaxis_title):
+    """Get or build a cached per-cell time-series figure in session state"""
+    fig = st.session_state.get(state_key)
+
+    # Rebuild only when the cell list itself changed
+    if fig is None or len(fig.data) != len(cells_data):
+        fig = go.Figure()
+
+        for cell in cells_data:
+            fig.add_trace(go.Scattergl(
+                x=[],
+                y=[],
+                mode='markers+lines',
+                name=cell["name"],
+                line=dict(width=3),
+                marker=dict(size=8)
+            ))
+
+        fig.update_layout(
+            title=title,
+            xaxis_title="Time",
+            yaxis_title=yaxis_title,
+            template="plotly_dark",
+            height=400
+        )
+
+        st.session_state[state_key] = fig
+
+    return fig
 
 def create_voltage_chart(cells_data):
     """Create voltage monitoring chart"""
     if not cells_data:
         return go.Figure()
-    
-    fig = go.Figure()
-    
-    for i, cell in enumerate(cells_data):
-        fig.add_trace(go.Scatter(
-            x=[cell["timestamp"]],
-            y=[cell["voltage"]],
-            mode='markers+lines',
-            name=cell["name"],
-            line=dict(width=3),
-            marker=dict(size=8)
-        ))
-    
-    fig.update_layout(
-        title="Cell Voltages",
-        xaxis_title="Time",
-        yaxis_title="Voltage (V)",
-        template="plotly_dark",
-        height=400
-    )
-    
+
+    fig = _get_cached_series_chart("voltage_fig", cells_data,
+                                   "Cell Voltages", "Voltage (V)")
+
+    # Mutate trace data in place so Streamlit patches the existing plot
+    # (Plotly.react) instead of tearing it down and rebuilding
+    with fig.batch_update():
+        for trace, cell in zip(fig.data, cells_data):
+            trace.name = cell["name"]
+            trace.x = [cell["timestamp"]]
+            trace.y = [cell["voltage"]]
+
     return fig
 
 def create_temperature_chart(cells_data):
     """Create temperature monitoring chart"""
     if not cells_data:
         return go.Figure()
-    
-    fig = go.Figure()
-    
-    for i, cell in enumerate(cells_data):
-        fig.add_trace(go.Scatter(
-            x=[cell["timestamp"]],
-            y=[cell["temperature"]],
-            mode='markers+lines',
-            name=cell["name"],
-            line=dict(width=3),
-            marker=dict(size=8)
-        ))
-    
-    fig.update_layout(
-        title="Temperature Monitoring",
-        xaxis_title="Time",
-        yaxis_title="Temperature (°C)",
-        template="plotly_dark",
-        height=400
-    )
-    
+
+    fig = _get_cached_series_chart("temperature_fig", cells_data,
+                                   "Temperature Monitoring", "Temperature (°C)")
+
+    with fig.batch_update():
+        for trace, cell in zip(fig.data, cells_data):
+            trace.name = cell["name"]
+            trace.x = [cell["timestamp"]]
+            trace.y = [cell["temperature"]]
+
     return fig
 
 def create_status_pie_chart(cells_data):
@@ -215,30 +416,35 @@ def create_status_pie_chart(cells_data):
     if not cells_data:
         return go.Figure()
     
-    status_counts = {'Normal': 0, 'Warning': 0, 'Critical': 0}
-    
-    for cell in cells_data:
-        status = get_cell_status(cell["voltage"], cell["temperature"], cell["type"])
-        if status["color"] == "critical":
-            status_counts['Critical'] += 1
-        elif status["color"] == "warning":
-            status_counts['Warning'] += 1
-        else:
-            status_counts['Normal'] += 1
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=list(status_counts.keys()),
-        values=list(status_counts.values()),
-        hole=0.3,
-        marker_colors=['#10b981', '#f59e0b', '#ef4444']
-    )])
-    
-    fig.update_layout(
-        title="Cell Status Distribution",
-        template="plotly_dark",
-        height=400
-    )
+    codes = np.fromiter((cell["status_code"] for cell in cells_data),
+                        np.int8, len(cells_data))
+    status_counts = {
+        'Normal': int(np.sum(codes <= 1)),
+        'Warning': int(np.sum(codes == 2)),
+        'Critical': int(np.sum(codes == 3))
+    }
     
+    fig = st.session_state.get("status_fig")
+
+    if fig is None:
+        fig = go.Figure(data=[go.Pie(
+            labels=list(status_counts.keys()),
+            values=list(status_counts.values()),
+            hole=0.3,
+            marker_colors=['#10b981', '#f59e0b', '#ef4444']
+        )])
+
+        fig.update_layout(
+            title="Cell Status Distribution",
+            template="plotly_dark",
+            height=400
+        )
+
+        st.session_state.status_fig = fig
+    else:
+        with fig.batch_update():
+            fig.data[0].values = list(status_counts.values())
+
     return fig
 
 def create_comparison_chart(current_data, previous_data):
@@ -275,7 +481,20 @@ def calculate_session_averages(session_data):
     """Calculate average values for a session"""
     if not session_data:
         return {'voltage': 0, 'temperature': 0, 'soc': 0, 'capacity': 0}
-    
+
+    # Columnar history store: reduce the recorded arrays directly
+    if isinstance(session_data, dict) and 'idx' in session_data:
+        with session_data['lock']:
+            rows = history_rows(session_data)
+            if not rows.size:
+                return {'voltage': 0, 'temperature': 0, 'soc': 0, 'capacity': 0}
+            return {
+                'voltage': round(float(session_data['v'][rows].mean()), 2),
+                'temperature': round(float(session_data['t'][rows].mean()), 1),
+                'soc': round(float(session_data['soc'][rows].mean()), 1),
+                'capacity': round(float(session_data['cap'][rows].mean()), 2)
+            }
+
     # If session_data contains historical data points
     if isinstance(session_data[0], dict) and 'cells' in session_data[0]:
         all_cells = []
@@ -287,51 +506,53 @@ def calculate_session_averages(session_data):
     
     if not cells_data:
         return {'voltage': 0, 'temperature': 0, 'soc': 0, 'capacity': 0}
-    
+
+    # One pass over the cells and one C-level reduction for all four metrics
+    arr = np.array([[cell['voltage'], cell['temperature'], cell['soc'], cell['capacity']]
+                    for cell in cells_data], dtype=np.float32)
+    voltage, temperature, soc, capacity = arr.mean(axis=0)
+
     return {
-        'voltage': round(np.mean([cell['voltage'] for cell in cells_data]), 2),
-        'temperature': round(np.mean([cell['temperature'] for cell in cells_data]), 1),
-        'soc': round(np.mean([cell['soc'] for cell in cells_data]), 1),
-        'capacity': round(np.mean([cell['capacity'] for cell in cells_data]), 2)
+        'voltage': round(float(voltage), 2),
+        'temperature': round(float(temperature), 1),
+        'soc': round(float(soc), 1),
+        'capacity': round(float(capacity), 2)
     }
 
-def export_to_csv(session_data, cells_data, tasks_data):
-    """Export data to CSV format"""
-    data_rows = []
-    
-    if session_data:
-        for session in session_data:
-            timestamp = session['timestamp']
-            active_task = next((task for task in session.get('tasks', []) 
-                              if task.get('status') == 'running'), None)
-            
-            for cell in session['cells']:
-                status = get_cell_status(cell['voltage'], cell['temperature'], cell['type'])
-                row = {
-                    'Timestamp': timestamp,
-                    'Cell Name': cell['name'],
-                    'Type': cell['type'],
-                    'Voltage (V)': cell['voltage'],
-                    'Current (A)': cell['current'],
-                    'Temperature (°C)': cell['temperature'],
-                    'Capacity (Wh)': cell['capacity'],
-                    'SOC (%)': cell['soc'],
-                    'Status': status['status'],
-                    'Active Task': active_task['type'] if active_task else 'None',
-                    'Task Progress (%)': active_task.get('progress', 0) if active_task else 0
-                }
-                data_rows.append(row)
-    
-    return pd.DataFrame(data_rows)
+def export_to_csv(hist):
+    """Export the recorded history to CSV format"""
+    if hist is None:
+        return pd.DataFrame()
+
+    with hist['lock']:
+        rows = history_rows(hist)
+        if not rows.size:
+            return pd.DataFrame()
+
+        # One row per cell per snapshot, built straight from the ring buffer
+        num_cells = len(hist['names'])
+        codes = hist['code'][rows].ravel()
+
+        return pd.DataFrame({
+            'Timestamp': np.repeat(hist['ts'][rows], num_cells),
+            'Cell Name': np.tile(np.array(hist['names'], dtype=object), rows.size),
+            'Type': np.tile(np.array(hist['types'], dtype=object), rows.size),
+            'Voltage (V)': hist['v'][rows].ravel(),
+            'Current (A)': hist['cur'][rows].ravel(),
+            'Temperature (°C)': hist['t'][rows].ravel(),
+            'Capacity (Wh)': hist['cap'][rows].ravel(),
+            'SOC (%)': hist['soc'][rows].ravel(),
+            'Status': [STATUS_TABLE[code]['status'] for code in codes],
+            'Active Task': np.repeat(hist['task_type'][rows], num_cells),
+            'Task Progress (%)': np.repeat(hist['task_progress'][rows], num_cells)
+        })
 
 def main():
     init_session_state()
     
     # Header
-    st.markdown('<h1 class="main-header">⚡ Battery Cell Monitoring & Task Management System</h1>', 
-                unsafe_allow_html=True)
-    st.markdown('<p style="text-align: center; color: #94a3b8; font-size: 1.1rem;">Advanced real-time monitoring with intelligent task automation and comprehensive analytics</p>', 
-                unsafe_allow_html=True)
+    st.markdown(_page_header(), unsafe_allow_html=True)
+    st.markdown(_page_subtitle(), unsafe_allow_html=True)
     
     # Sidebar Configuration
     with st.sidebar:
@@ -350,21 +571,26 @@ def main():
         # Cell Management
         st.header("🔋 Cell Management")
         
-        num_cells = st.number_input("Number of Cells", min_value=1, max_value=20, value=1)
-        default_cell_type = st.selectbox("Default Cell Type", 
-                                        options=list(CELL_TYPES.keys()),
-                                        format_func=lambda x: f"{x} - {CELL_TYPES[x]['name']}")
-        
-        if st.button("Generate Cells", type="primary"):
-            st.session_state.cells_data = []
-            for i in range(num_cells):
-                cell_data = generate_cell_data(default_cell_type)
+        # Form so tweaking the inputs doesn't rerun the script until submit
+        with st.form("cell_form"):
+            num_cells = st.number_input("Number of Cells", min_value=1, max_value=20, value=1)
+            default_cell_type = st.selectbox("Default Cell Type",
+                                            options=list(CELL_TYPES.keys()),
+                                            format_func=lambda x: f"{x} - {CELL_TYPES[x]['name']}")
+            generate_cells = st.form_submit_button("Generate Cells", type="primary")
+
+        if generate_cells:
+            cells = generate_cells_batch([default_cell_type] * num_cells)
+            for i, cell_data in enumerate(cells):
                 cell_data.update({
                     "id": i + 1,
                     "name": f"Cell_{i + 1}",
                     "type": default_cell_type
                 })
-                st.session_state.cells_data.append(cell_data)
+            st.session_state.cells_data = cells
+            st.session_state.hist = alloc_history(
+                [cell["name"] for cell in cells],
+                [cell["type"] for cell in cells])
             st.success(f"Generated {num_cells} cells successfully!")
             st.rerun()
         
@@ -373,9 +599,11 @@ def main():
         # Task Management
         st.header("⚙️ Task Management")
         
-        num_tasks = st.number_input("Number of Tasks", min_value=1, max_value=10, value=1)
-        
-        if st.button("Configure Tasks"):
+        with st.form("task_mgmt_form"):
+            num_tasks = st.number_input("Number of Tasks", min_value=1, max_value=10, value=1)
+            configure_tasks = st.form_submit_button("Configure Tasks")
+
+        if configure_tasks:
             st.session_state.show_task_config = True
         
         st.divider()
@@ -400,25 +628,14 @@ def main():
         with col2:
             if st.button("🔄 Update Data"):
                 if st.session_state.cells_data:
-                    for cell in st.session_state.cells_data:
-                        new_data = generate_cell_data(cell["type"])
-                        cell.update(new_data)
-                    
-                    # Store session data
-                    st.session_state.session_data.append({
-                        'timestamp': datetime.now(),
-                        'cells': st.session_state.cells_data.copy(),
-                        'tasks': st.session_state.tasks_data.copy()
-                    })
-                    
+                    # Snapshotting happens on the worker thread
+                    request_tick()
                     st.success("Data updated!")
                     st.rerun()
         
         if st.button("📊 Export CSV"):
-            if st.session_state.session_data:
-                df = export_to_csv(st.session_state.session_data, 
-                                 st.session_state.cells_data, 
-                                 st.session_state.tasks_data)
+            if st.session_state.hist is not None and st.session_state.hist['idx'] > 0:
+                df = export_to_csv(st.session_state.hist)
                 csv = df.to_csv(index=False)
                 st.download_button(
                     label="Download CSV",
@@ -441,7 +658,7 @@ def main():
                     },
                     'cells_data': st.session_state.cells_data,
                     'tasks_data': st.session_state.tasks_data,
-                    'session_data': st.session_state.session_data
+                    'history': st.session_state.hist
                 }
                 
                 # In a real app, you'd save this to a database or file
@@ -456,103 +673,128 @@ def main():
     if hasattr(st.session_state, 'show_task_config') and st.session_state.show_task_config:
         with st.expander("Configure Tasks", expanded=True):
             st.subheader("Task Configuration")
-            
-            tasks = []
-            for i in range(num_tasks):
-                st.write(f"**Task {i + 1}**")
+
+            # Single form: editing task fields doesn't rerun until submit
+            with st.form("task_config_form"):
+                tasks = []
+                for i in range(num_tasks):
+                    st.write(f"**Task {i + 1}**")
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        task_type = st.selectbox(f"Task Type {i + 1}",
+                                               ["CC_CV", "IDLE", "CC_CD"],
+                                               key=f"task_type_{i}")
+
+                    with col2:
+                        duration = st.number_input(f"Duration (seconds) {i + 1}",
+                                                 min_value=1, value=300,
+                                                 key=f"duration_{i}")
+
+                    task = {
+                        'id': i + 1,
+                        'type': task_type,
+                        'duration': duration,
+                        'progress': 0,
+                        'status': 'pending',
+                        'start_time': None,
+                        'end_time': None
+                    }
+
+                    # Task-specific parameters
+                    if task_type == "CC_CV":
+                        col3, col4 = st.columns(2)
+                        with col3:
+                            task['cccp'] = st.text_input(f"CC/CP Value {i + 1}",
+                                                       value="2A", key=f"cccp_{i}")
+                            task['cv_voltage'] = st.number_input(f"CV Voltage {i + 1}",
+                                                               value=3.6, key=f"cv_voltage_{i}")
+                        with col4:
+                            task['current'] = st.number_input(f"Current {i + 1}",
+                                                            value=1.0, key=f"current_{i}")
+                            task['capacity'] = st.number_input(f"Capacity {i + 1}",
+                                                             value=2.5, key=f"capacity_{i}")
+
+                    elif task_type == "CC_CD":
+                        col3, col4 = st.columns(2)
+                        with col3:
+                            task['cccp'] = st.text_input(f"CC/CP Value {i + 1}",
+                                                       value="2A", key=f"cccp_cd_{i}")
+                        with col4:
+                            task['voltage'] = st.number_input(f"Discharge Voltage {i + 1}",
+                                                            value=2.8, key=f"voltage_{i}")
+                            task['capacity'] = st.number_input(f"Capacity {i + 1}",
+                                                             value=2.5, key=f"capacity_cd_{i}")
+
+                    tasks.append(task)
+                    st.divider()
+
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    task_type = st.selectbox(f"Task Type {i + 1}", 
-                                           ["CC_CV", "IDLE", "CC_CD"], 
-                                           key=f"task_type_{i}")
-                
+                    cancel_tasks = st.form_submit_button("Cancel Tasks")
+
                 with col2:
-                    duration = st.number_input(f"Duration (seconds) {i + 1}", 
-                                             min_value=1, value=300, 
-                                             key=f"duration_{i}")
-                
-                task = {
-                    'id': i + 1,
-                    'type': task_type,
-                    'duration': duration,
-                    'progress': 0,
-                    'status': 'pending',
-                    'start_time': None,
-                    'end_time': None
-                }
-                
-                # Task-specific parameters
-                if task_type == "CC_CV":
-                    col3, col4 = st.columns(2)
-                    with col3:
-                        task['cccp'] = st.text_input(f"CC/CP Value {i + 1}", 
-                                                   value="2A", key=f"cccp_{i}")
-                        task['cv_voltage'] = st.number_input(f"CV Voltage {i + 1}", 
-                                                           value=3.6, key=f"cv_voltage_{i}")
-                    with col4:
-                        task['current'] = st.number_input(f"Current {i + 1}", 
-                                                        value=1.0, key=f"current_{i}")
-                        task['capacity'] = st.number_input(f"Capacity {i + 1}", 
-                                                         value=2.5, key=f"capacity_{i}")
-                
-                elif task_type == "CC_CD":
-                    col3, col4 = st.columns(2)
-                    with col3:
-                        task['cccp'] = st.text_input(f"CC/CP Value {i + 1}", 
-                                                   value="2A", key=f"cccp_cd_{i}")
-                    with col4:
-                        task['voltage'] = st.number_input(f"Discharge Voltage {i + 1}", 
-                                                        value=2.8, key=f"voltage_{i}")
-                        task['capacity'] = st.number_input(f"Capacity {i + 1}", 
-                                                         value=2.5, key=f"capacity_cd_{i}")
-                
-                tasks.append(task)
-                st.divider()
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Cancel Tasks"):
-                    st.session_state.show_task_config = False
-                    st.rerun()
-            
-            with col2:
-                if st.button("Save Tasks", type="primary"):
-                    st.session_state.tasks_data = tasks
-                    st.session_state.show_task_config = False
-                    st.success(f"Configured {len(tasks)} tasks successfully!")
-                    st.rerun()
+                    save_tasks = st.form_submit_button("Save Tasks", type="primary")
+
+            if cancel_tasks:
+                st.session_state.show_task_config = False
+                st.rerun()
+
+            if save_tasks:
+                st.session_state.tasks_data = tasks
+                st.session_state.show_task_config = False
+                st.success(f"Configured {len(tasks)} tasks successfully!")
+                st.rerun()
     
     # Main Content Area
-    
+
+    # Live monitoring panel runs as a fragment so only this section reruns
+    # on each tick; the sidebar, CSS and header are left untouched.
+    run_every = "3s" if st.session_state.monitoring_active else None
+
+    @st.fragment(run_every=run_every)
+    def live_panel():
+        render_live_panel()
+
+    live_panel()
+
+def render_live_panel():
+    # Refresh cell readings on each monitoring tick (worker thread)
+    if st.session_state.monitoring_active and st.session_state.cells_data:
+        request_tick()
+
     # Alerts Section
     if st.session_state.cells_data:
         critical_cells = []
         warning_cells = []
-        
+
         for cell in st.session_state.cells_data:
-            status = get_cell_status(cell["voltage"], cell["temperature"], cell["type"])
-            if status["color"] == "critical":
+            if cell["status_code"] == 3:
                 critical_cells.append(cell)
-            elif status["color"] == "warning":
+            elif cell["status_code"] == 2:
                 warning_cells.append(cell)
         
         if critical_cells or warning_cells:
             st.subheader("🚨 System Alerts")
             
+            # One markdown call (one delta) per alert block instead of one per cell
             if critical_cells:
-                st.markdown('<div class="alert-critical">', unsafe_allow_html=True)
-                st.error("**🚨 Critical Alerts**")
-                for cell in critical_cells:
-                    st.write(f"**{cell['name']}**: {cell['voltage']}V, {cell['temperature']}°C - Immediate attention required!")
-                st.markdown('</div>', unsafe_allow_html=True)
-            
+                lines = "<br>".join(
+                    f"<b>{cell['name']}</b>: {cell['voltage']}V, "
+                    f"{cell['temperature']}°C - Immediate attention required!"
+                    for cell in critical_cells)
+                st.markdown(
+                    f'<div class="alert-critical"><b>🚨 Critical Alerts</b><br>{lines}</div>',
+                    unsafe_allow_html=True)
+
             if warning_cells:
-                st.markdown('<div class="alert-warning">', unsafe_allow_html=True)
-                st.warning("**⚠️ Warnings**")
-                for cell in warning_cells:
-                    st.write(f"**{cell['name']}**: {cell['voltage']}V, {cell['temperature']}°C - Monitor closely")
-                st.markdown('</div>', unsafe_allow_html=True)
+                lines = "<br>".join(
+                    f"<b>{cell['name']}</b>: {cell['voltage']}V, "
+                    f"{cell['temperature']}°C - Monitor closely"
+                    for cell in warning_cells)
+                st.markdown(
+                    f'<div class="alert-warning"><b>⚠️ Warnings</b><br>{lines}</div>',
+                    unsafe_allow_html=True)
     
     # System Overview
     st.subheader("📊 System Overview")
@@ -620,24 +862,34 @@ def main():
     
     with tab1:
         if st.session_state.cells_data:
-            # Create dataframe for display
-            display_data = []
-            for cell in st.session_state.cells_data:
-                status = get_cell_status(cell["voltage"], cell["temperature"], cell["type"])
-                display_data.append({
-                    "Cell Name": cell["name"],
-                    "Type": cell["type"],
-                    "Voltage (V)": cell["voltage"],
-                    "Current (A)": cell["current"],
-                    "Temperature (°C)": cell["temperature"],
-                    "Capacity (Wh)": cell["capacity"],
-                    "SOC (%)": cell["soc"],
-                    "Status": status["status"],
-                    "Last Updated": cell["timestamp"].strftime("%H:%M:%S")
-                })
-            
-            df = pd.DataFrame(display_data)
-            st.dataframe(df, use_container_width=True)
+            # Create dataframe for display with explicit dtypes so the
+            # Arrow serialization path doesn't have to re-infer them
+            cells = st.session_state.cells_data
+            df = pd.DataFrame({
+                "Cell Name": [cell["name"] for cell in cells],
+                "Type": [cell["type"] for cell in cells],
+                "Voltage (V)": [cell["voltage"] for cell in cells],
+                "Current (A)": [cell["current"] for cell in cells],
+                "Temperature (°C)": [cell["temperature"] for cell in cells],
+                "Capacity (Wh)": [cell["capacity"] for cell in cells],
+                "SOC (%)": [cell["soc"] for cell in cells],
+                "Status": [cell["status_str"] for cell in cells],
+                "Last Updated": [cell["timestamp"] for cell in cells]
+            }).astype({
+                "Voltage (V)": "float32",
+                "Current (A)": "float32",
+                "Temperature (°C)": "float32",
+                "Capacity (Wh)": "float32",
+                "SOC (%)": "float32"
+            })
+            st.dataframe(df.style.format({
+                "Voltage (V)": "{:.2f}",
+                "Current (A)": "{:.2f}",
+                "Temperature (°C)": "{:.1f}",
+                "Capacity (Wh)": "{:.2f}",
+                "SOC (%)": "{:.1f}",
+                "Last Updated": "{:%H:%M:%S}"
+            }), use_container_width=True)
         else:
             st.info("👈 Configure cells from the sidebar to start monitoring")
     
@@ -647,11 +899,13 @@ def main():
             
             with col1:
                 voltage_chart = create_voltage_chart(st.session_state.cells_data)
-                st.plotly_chart(voltage_chart, use_container_width=True)
-            
+                st.plotly_chart(voltage_chart, use_container_width=True,
+                                key="voltage_chart")
+
             with col2:
                 temperature_chart = create_temperature_chart(st.session_state.cells_data)
-                st.plotly_chart(temperature_chart, use_container_width=True)
+                st.plotly_chart(temperature_chart, use_container_width=True,
+                                key="temperature_chart")
         else:
             st.info("No data available for charts")
     
@@ -666,9 +920,11 @@ def main():
         
         with col2:
             if st.button("Compare Sessions"):
-                if st.session_state.session_data and st.session_state.previous_session_data:
+                if (st.session_state.hist is not None
+                        and st.session_state.hist['idx'] > 0
+                        and st.session_state.previous_session_data):
                     comparison_chart = create_comparison_chart(
-                        st.session_state.session_data, 
+                        st.session_state.hist,
                         st.session_state.previous_session_data
                     )
                     st.plotly_chart(comparison_chart, use_container_width=True)
@@ -681,23 +937,24 @@ def main():
             
             with col1:
                 pie_chart = create_status_pie_chart(st.session_state.cells_data)
-                st.plotly_chart(pie_chart, use_container_width=True)
+                st.plotly_chart(pie_chart, use_container_width=True,
+                                key="status_pie_chart")
             
             with col2:
                 # Time series chart for SOC
-                if st.session_state.session_data:
-                    timestamps = [data['timestamp'] for data in st.session_state.session_data]
-                    avg_socs = []
-                    
-                    for data in st.session_state.session_data:
-                        if data['cells']:
-                            avg_soc = np.mean([cell['soc'] for cell in data['cells']])
-                            avg_socs.append(avg_soc)
-                        else:
-                            avg_socs.append(0)
-                    
+                hist = st.session_state.hist
+                if hist is not None and hist['idx'] > 0:
+                    with hist['lock']:
+                        rows = history_rows(hist)
+                        timestamps = hist['ts'][rows]
+                        avg_socs = hist['avg_soc'][rows]
+
+                    # Keep the plotted point count bounded for long sessions
+                    if avg_socs.size > 2000:
+                        timestamps, avg_socs = lttb(timestamps, avg_socs, 1000)
+
                     fig = go.Figure()
-                    fig.add_trace(go.Scatter(
+                    fig.add_trace(go.Scattergl(
                         x=timestamps,
                         y=avg_socs,
                         mode='lines+markers',
@@ -718,11 +975,6 @@ def main():
                     st.info("No historical data available")
         else:
             st.info("No data available for analytics")
-    
-    # Auto-refresh when monitoring is active
-    if st.session_state.monitoring_active:
-        time.sleep(3)
-        st.rerun()
 
 if __name__ == "__main__":
     main()